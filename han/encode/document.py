@@ -33,11 +33,13 @@ class DocumentEncoder:
             for word, index in zip(tokens, self._vocab.forward(tokens)):
                 sentence.append(index)
                 if word == ".":
-                    document.append(torch.Tensor(sentence))
+                    document.append(
+                        torch.as_tensor(sentence, dtype=torch.long)
+                    )
                     sentence = []
 
             if len(sentence) > 0:
-                document.append(torch.Tensor(sentence))
+                document.append(torch.as_tensor(sentence, dtype=torch.long))
             documents.append(document)
         return documents
 
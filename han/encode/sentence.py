@@ -1,4 +1,5 @@
 """Tokenize text, and encode words to integers."""
+import itertools
 import typing
 import torch
 from .. import vocabulary as v
@@ -28,9 +29,26 @@ class SentenceEncoder:
         self.tokenizer = tokenizer
 
     def forward(self, texts: list[str]) -> list[torch.Tensor]:
-        """Implement `forward`."""
+        """Implement `forward`.
+
+        Tokenize all the texts first, then encode the flattened
+        tokens with one vocabulary call.  The per-text tensors are
+        views over a single buffer to avoid one allocation per text.
+
+        """
+        tokens = [self.tokenizer(text) for text in texts]
+        ids = torch.as_tensor(
+            self._vocab.forward(
+                list(itertools.chain.from_iterable(tokens))
+            ),
+            dtype=torch.long,
+        )
+        offsets = [0] + list(
+            itertools.accumulate(len(words) for words in tokens)
+        )
         return [
-            torch.Tensor(self._vocab(self.tokenizer(text))) for text in texts
+            ids[offsets[index] : offsets[index + 1]]
+            for index in range(len(texts))
         ]
 
     def get_vocabulary_size(self) -> int:
@@ -1,6 +1,7 @@
 """Preprocessed AG NEWS dataset."""
 import typing as t
 import torch
+import torch.nn.utils.rnn as rnn
 import torchtext.datasets as data
 import torchtext.data as tdata
 import torch.utils.data as da
@@ -52,17 +53,26 @@ class AgNewsCollateSentenceFn:
         self,
         encoder: s.SentenceEncodeProtocol,
         enforce_sorted: bool,
+        pack: bool = False,
         device=torch.device("cpu"),
     ):
-        """Take an encoder."""
+        """Take an encoder.
+
+        If `pack` is `True`, `__call__` emits the sentences as one
+        `PackedSequence` so the model does not pack them per forward.
+
+        """
         self._encoder = encoder
         self._enforce_sorted = enforce_sorted
+        self._pack = pack
         self._device = device
 
     def __call__(
         self, batch: list[t.Tuple[int, str]]
-    ) -> t.Tuple[list[torch.Tensor], torch.Tensor]:
-        """Return the list of sentences, and labels.
+    ) -> t.Tuple[
+        t.Union[list[torch.Tensor], rnn.PackedSequence], torch.Tensor
+    ]:
+        """Return the sentences, and labels.
 
         Sort the batch by the length of a sentence in a decreasing order
         if `self.enforce_sorted` is `True`.
@@ -71,12 +81,18 @@ class AgNewsCollateSentenceFn:
         if self._enforce_sorted:
             batch = sorted(batch, key=lambda e: len(e[1]), reverse=True)
 
-        texts = [
-            _allocate(text, self._device)
-            for text in self._encoder.forward([text for _, text in batch])
-        ]
+        encoded = self._encoder.forward([text for _, text in batch])
+        if self._pack:
+            texts = _allocate_packed(
+                rnn.pack_sequence(encoded, enforce_sorted=False),
+                self._device,
+            )
+        else:
+            texts = [_allocate(text, self._device) for text in encoded]
         labels = _allocate(
-            torch.Tensor([label - 1 for label, _ in batch]).to(torch.long),
+            torch.as_tensor(
+                [label - 1 for label, _ in batch], dtype=torch.long
+            ),
             self._device,
         )
         return texts, labels
@@ -97,10 +113,12 @@ class AgNewsCollateDocumentFn:
     def __init__(
         self,
         encoder: d.DocumentEncodeProtocol,
+        enforce_sorted: bool = False,
         device: torch.device = torch.device("cpu"),
     ):
         """Take an encoder."""
         self._encoder = encoder
+        self._enforce_sorted = enforce_sorted
         self._device = device
 
     def __call__(
@@ -109,16 +127,26 @@ class AgNewsCollateDocumentFn:
         """Return indexed documents and labels.
 
         Return a tuple. The first item is documents. The second item
-        is labels.
+        is labels.  Sort the batch by the number of the sentences in
+        a document in a decreasing order if `self._enforce_sorted` is
+        `True`.
 
         """
-        labels: torch.Tensor = _allocate(
-            torch.Tensor([item[0] - 1 for item in batch]).to(torch.long),
-            self._device,
-        )
+        labels: list[int] = [item[0] - 1 for item in batch]
         encoded: list[list[torch.Tensor]] = self._encoder.forward(
             [text for _, text in batch]
         )
+        if self._enforce_sorted:
+            pairs = sorted(
+                zip(labels, encoded),
+                key=lambda e: len(e[1]),
+                reverse=True,
+            )
+            labels = [label for label, _ in pairs]
+            encoded = [document for _, document in pairs]
+        labels: torch.Tensor = _allocate(
+            torch.as_tensor(labels, dtype=torch.long), self._device
+        )
         encoded = [
             [_allocate(sentence, self._device) for sentence in document]
             for document in encoded
@@ -167,8 +195,23 @@ def build_ag_news_vocabulary(
     return v.build_vocabulary((tokenizer(doc) for _, doc in agnews))
 
 
+def _allocate_packed(
+    packed: rnn.PackedSequence, device: torch.device
+) -> rnn.PackedSequence:
+    if packed.data.device == device:
+        return packed
+    return packed.to(device)
+
+
 def _allocate(tensor: torch.Tensor, device: torch.device) -> torch.Tensor:
+    """Move `tensor` to `device`.
+
+    Pin the host memory and copy asynchronously when the target is a
+    CUDA device so the transfer can overlap with the collation.
+
+    """
     if tensor.device == device:
         return tensor
-    else:
-        return tensor.to(device)
+    if device.type == "cuda" and tensor.device.type == "cpu":
+        return tensor.pin_memory().to(device, non_blocking=True)
+    return tensor.to(device)
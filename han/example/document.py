@@ -54,7 +54,7 @@ class _DocumentTrainImpl:
 
     def create_collate_fn(self, encoder) -> ag.AgNewsCollateSentenceFn:
         """Impl the protocol."""
-        return ag.AgNewsCollateDocumentFn(encoder)
+        return ag.AgNewsCollateDocumentFn(encoder, enforce_sorted=True)
 
     def create_model(
         self, num_classes: int, vocabulary_size: int
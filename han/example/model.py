@@ -3,6 +3,7 @@ import typing as t
 import os
 import logging
 import torch
+import torch.distributed as dist
 import torch.nn as nn
 import torch.utils.data as da
 import torchtext.vocab as v
@@ -50,6 +51,7 @@ class AgNewsTrainer:
         self._epoch = epoch
         self._train_num = train_num
         self._test_num = test_num
+        self._train_sampler: t.Optional[da.DistributedSampler] = None
 
     def train(self, encoder_path: str, model_path: str):
         """Fit a model on AG News."""
@@ -70,6 +72,7 @@ class AgNewsTrainer:
         loss_fn = nn.CrossEntropyLoss().to(self._device)
 
         sparse_params, dense_params = model.sparse_dense_parameters()
+        trained_model = self._wrap_distributed(model)
         optimizer = _CompositeOptimizer(sparse_params, dense_params)
         scheduler = _CompositeScheduler(optimizer.get_optimizers())
 
@@ -84,10 +87,14 @@ class AgNewsTrainer:
 
         for epoch_index in range(self._epoch):
             _logger.info(f"Epoch {epoch_index}")
-            model.train()
+            if self._train_sampler is not None:
+                # Reseed the shuffle; otherwise every epoch replays
+                # the same order on each rank.
+                self._train_sampler.set_epoch(epoch_index)
+            trained_model.train()
             metrics.reset()
             for sentences, labels in train_dataloader:
-                preds = model(sentences)[0]
+                preds = trained_model(sentences)[0]
                 optimizer.zero_grad()
                 loss = loss_fn(preds, labels)
                 loss.backward()
@@ -96,10 +103,10 @@ class AgNewsTrainer:
             scheduler.step()
             self._log("Train", metrics.compute())
             with torch.no_grad():
-                model.eval()
+                trained_model.eval()
                 metrics.reset()
                 for sentences, labels in test_dataloader:
-                    preds = model(sentences)[0]
+                    preds = trained_model(sentences)[0]
                     metrics(preds.argmax(1), labels)
                 self._log("Test", metrics.compute())
         torch.save(model, model_path)
@@ -113,6 +120,29 @@ class AgNewsTrainer:
         vocabulary = ag.build_ag_news_vocabulary(agnews_train, tokenizer)
         return self._train_protocol.create_encoder(vocabulary, tokenizer)
 
+    def _wrap_distributed(self, model: nn.Module) -> nn.Module:
+        """Wrap `model` in `DistributedDataParallel`.
+
+        Return `model` as it is unless a process group is
+        initialized.  A sparse embedding gradient is not supported:
+        `DistributedDataParallel` cannot allreduce sparse gradients
+        over NCCL, so models built with `embedding_sparse=True` must
+        train single-process.
+
+        """
+        if self._is_distributed():
+            if model.sparse_dense_parameters()[0]:
+                raise RuntimeError(
+                    "DistributedDataParallel does not support the "
+                    "sparse embedding gradient. "
+                    "Pass embedding_sparse=False."
+                )
+            return nn.parallel.DistributedDataParallel(model)
+        return model
+
+    def _is_distributed(self) -> bool:
+        return dist.is_available() and dist.is_initialized()
+
     def _load_dataloders(
         self, encoder
     ) -> t.Tuple[da.DataLoader, da.DataLoader]:
@@ -120,12 +150,24 @@ class AgNewsTrainer:
         collate_fn = self._train_protocol.create_collate_fn(encoder).to(
             self._device
         )
-        train_dataloader = da.DataLoader(
-            agnews_factory.get_train(self._train_num),
-            batch_size=50,
-            shuffle=True,
-            collate_fn=collate_fn,
-        )
+        train_dataset = agnews_factory.get_train(self._train_num)
+        if self._is_distributed():
+            self._train_sampler = da.DistributedSampler(
+                train_dataset, shuffle=True
+            )
+            train_dataloader = da.DataLoader(
+                train_dataset,
+                batch_size=50,
+                sampler=self._train_sampler,
+                collate_fn=collate_fn,
+            )
+        else:
+            train_dataloader = da.DataLoader(
+                train_dataset,
+                batch_size=50,
+                shuffle=True,
+                collate_fn=collate_fn,
+            )
         test_dataloader = da.DataLoader(
             agnews_factory.get_test(self._test_num),
             batch_size=50,
@@ -154,7 +196,14 @@ class _CompositeOptimizer:
             self._optimizers.append(torch.optim.SparseAdam(sparse_params))
 
         if dense_params:
-            self._optimizers.append(torch.optim.Adam(dense_params))
+            if all(p.is_cuda for p in dense_params):
+                # The fused kernel updates all the parameters in one
+                # launch instead of one per parameter.
+                self._optimizers.append(
+                    torch.optim.AdamW(dense_params, fused=True)
+                )
+            else:
+                self._optimizers.append(torch.optim.AdamW(dense_params))
 
     def get_optimizers(self) -> list[torch.optim.Optimizer]:
         return self._optimizers
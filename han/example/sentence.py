@@ -55,7 +55,7 @@ class _SentenceTrainImpl:
 
     def create_collate_fn(self, encoder) -> ag.AgNewsCollateSentenceFn:
         """Impl the protocol."""
-        return ag.AgNewsCollateSentenceFn(encoder, False)
+        return ag.AgNewsCollateSentenceFn(encoder, False, pack=True)
 
     def create_model(
         self,
@@ -21,26 +21,40 @@ class AttentionModel(nn.Module):
         seed = nn.init.uniform_(torch.Tensor(output_dim), a=-1.0, b=1.0)
         self.weights = nn.Parameter(seed)
 
-    def forward(self, h: torch.Tensor) -> t.Tuple[torch.Tensor, torch.Tensor]:
+    def forward(
+        self,
+        h: torch.Tensor,
+        lengths: t.Optional[torch.Tensor] = None,
+    ) -> t.Tuple[torch.Tensor, torch.Tensor]:
         """Transform `h`.
 
         The shape of `h` is (the max number of the words or sentences,
-        batch num, dim).
+        batch num, dim).  `lengths` holds the number of the valid
+        items of each entry; the positions after them are padding,
+        and their attentions are zero so the softmax ignores them.
 
         Return two tensors.  The first one is embedded entities. The
         shape is (the max number of the words or sentences, dim).  The
-        second one is attention. The shape is (the max number of the
-        words or sentences, batch size).
+        second one is attention normalized with a softmax over the
+        items. The shape is (the max number of the words or
+        sentences, batch size).
 
         """
         u = self.linear(h)
         u = self.tanh(u)
-        alpha = self._calc_args_softmax(u, self.weights)
-        del u
+        scores = self._calc_args_softmax(u, self.weights)
+        if lengths is not None:
+            mask = torch.arange(h.size(0), device=h.device).unsqueeze(
+                1
+            ) >= lengths.to(h.device).unsqueeze(0)
+            scores = scores.masked_fill_(mask, float("-inf"))
+        alpha = self._sofmax(scores)
         h = self._embed(h, alpha)
         return h, alpha
 
-    def _calc_args_softmax(self, u, weights) -> torch.Tensor:
+    def _calc_args_softmax(
+        self, u: torch.Tensor, weights: torch.Tensor
+    ) -> torch.Tensor:
         """Calculate arguments for softmax.
 
         The shape of u is (the number of items of an entry, batch
@@ -55,7 +69,21 @@ class AttentionModel(nn.Module):
         """Pass `x` to a softmax."""
         return nn.functional.softmax(x, dim=0)
 
-    def _embed(self, h: torch.Tensor, alpha: torch.Tensor):
-        return torch.sum(
-            torch.mul(torch.unsqueeze(alpha, 2).expand_as(h), h), 0
-        )
+    def _embed(self, h: torch.Tensor, alpha: torch.Tensor) -> torch.Tensor:
+        # One einsum contraction, instead of materializing the
+        # expanded alpha and the elementwise product.
+        return torch.einsum("lb,lbd->bd", alpha, h)
+
+
+def script(model: AttentionModel) -> nn.Module:
+    """Compile `model` with TorchScript.
+
+    The forward path of `AttentionModel` is a chain of small ops, so
+    the Python dispatch overhead dominates it.  Fall back to the
+    eager `model` if the compilation fails.
+
+    """
+    try:
+        return torch.jit.script(model)
+    except RuntimeError:
+        return model
@@ -49,14 +49,40 @@ class DocumentModel(nn.Module):
         x, word_alpha = self._sentence_model(sentences)
         # x is a tuple of tensors.
         x = torch.split(x, doc_lens)
-        x = rnn.pad_sequence(x)
-        x = rnn.pack_padded_sequence(x, doc_lens, enforce_sorted=False)
+        # A collate function may have sorted the batch by the number
+        # of the sentences; packing such a batch as sorted skips the
+        # internal re-sort.
+        is_sorted = all(
+            doc_lens[index] >= doc_lens[index + 1]
+            for index in range(len(doc_lens) - 1)
+        )
+        x = rnn.pack_sequence(x, enforce_sorted=is_sorted)
         x = self._gru(x)[0]
         # The shape of x is (max num of sentence, num of docs, dim)
-        x = rnn.pad_packed_sequence(x)[0]
-        x, alpha = self._attention_model(x)
+        x, lengths = rnn.pad_packed_sequence(x)
+        x, alpha = self._scripted_attention()(x, lengths)
         return x, alpha, word_alpha, doc_lens
 
+    def _scripted_attention(self) -> nn.Module:
+        """Return the TorchScript form of `self._attention_model`.
+
+        The scripted module shares its parameters with the eager
+        one.  Cache it outside the module state because TorchScript
+        modules cannot go through `torch.save`.
+
+        """
+        scripted = self.__dict__.get("_scripted")
+        if scripted is None:
+            scripted = a.script(self._attention_model)
+            self.__dict__["_scripted"] = scripted
+        return scripted
+
+    def __getstate__(self):
+        """Drop the TorchScript cache, which pickle cannot handle."""
+        state = self.__dict__.copy()
+        state.pop("_scripted", None)
+        return state
+
     def sparse_dense_parameters(
         self,
     ) -> t.Tuple[list[nn.parameter.Parameter], list[nn.parameter.Parameter]]:
@@ -64,8 +90,9 @@ class DocumentModel(nn.Module):
         sparse: list[
             nn.Parameter
         ] = self._sentence_model.sparse_dense_parameters()[0]
+        sparse_ids = set(id(s) for s in sparse)
         return sparse, [
-            p for p in self.parameters() if not [s for s in sparse if s is p]
+            p for p in self.parameters() if id(p) not in sparse_ids
         ]
 
 
@@ -112,6 +139,7 @@ class DocumentModelFactory:
         sentence_dim: t.Optional[int] = None,
         doc_gru_hidden_size: t.Optional[int] = None,
         doc_dim=None,
+        quantize: t.Optional[bool] = None,
     ):
         """Use pretraiend embeddings."""
         return self._create(
@@ -122,6 +150,7 @@ class DocumentModelFactory:
                 embedding_sparse=embedding_sparse,
                 gru_hidden_size=gru_hidden_size,
                 sentence_dim=sentence_dim,
+                quantize=quantize,
             ),
             doc_gru_hidden_size=doc_gru_hidden_size,
             doc_dim=doc_dim,
@@ -166,8 +195,9 @@ class DocumentClassifier(nn.Module):
 
         """
         sparse = self._document_model.sparse_dense_parameters()[0]
+        sparse_ids = set(id(s) for s in sparse)
         return sparse, [
-            p for p in self.parameters() if not [s for s in sparse if s is p]
+            p for p in self.parameters() if id(p) not in sparse_ids
         ]
 
 
@@ -216,6 +246,7 @@ class DocumentClassifierFactory:
         sentence_dim: t.Optional[int] = None,
         doc_gru_hidden_size: t.Optional[int] = None,
         doc_dim=None,
+        quantize: t.Optional[bool] = None,
     ):
         """Use pretrained embedding."""
         return DocumentClassifier(
@@ -228,6 +259,7 @@ class DocumentClassifierFactory:
                 sentence_dim=sentence_dim,
                 doc_gru_hidden_size=doc_gru_hidden_size,
                 doc_dim=doc_dim,
+                quantize=quantize,
             ),
             num_classes,
         )
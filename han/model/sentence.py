@@ -3,6 +3,7 @@ import typing as t
 import torch
 import torch.nn as nn
 import torch.nn.utils.rnn as r
+import torch.utils.checkpoint as c
 from . import attention as a
 
 
@@ -40,57 +41,171 @@ class SentenceModel(nn.Module):
         self.sentence_dim = sentence_dim
 
     def forward(
-        self, x: list[torch.Tensor]
+        self,
+        x: t.Union[list[torch.Tensor], r.PackedSequence],
+        lengths: t.Optional[torch.Tensor] = None,
     ) -> t.Tuple[torch.Tensor, torch.Tensor]:
         """Calculate sentence vectors, and attentions.
 
-        `x` is a list of index sentences.  Return a tuple of two
-        tensors.  The first one is the sentence embeddings, and its
-        shape is (num of `x`, `self.sentence_dim`) The second one
-        represents attention.  The shape is (the length of the longest
-        tensor in `x`, num of `x`).
+        `x` is a list of index sentences, or a `PackedSequence` that
+        a collate function packed once per batch.  A caller that
+        already knows the length of each sentence can pass `lengths`
+        to skip recomputing them; it is ignored for a
+        `PackedSequence`.  Return a tuple of two tensors.  The first
+        one is the sentence embeddings, and its shape is (num of
+        `x`, `self.sentence_dim`) The second one represents
+        attention.  The shape is (the length of the longest tensor
+        in `x`, num of `x`).
 
         """
-        lengths = self._get_lengths(x)
-        # x.shape is (longest length, batch size)
-        x = self._pad_sequence(x)
-        # x.shape is (longest length, batch size, embedding dim)
-        x: torch.Tensor = self._embedding(x)
-        x: r.PackedSequence = self._pack_embeddings(x, lengths)
-        x: torch.Tensor = self._gru(x)[0]
-        # Linear cannot accept any packed sequences.
-        x, _ = r.pad_packed_sequence(x)
-        return self._attention_model(x)
+        if isinstance(x, r.PackedSequence):
+            # `pad_packed_sequence` restores the original order from
+            # `unsorted_indices`, so no permutation is needed here.
+            return self._scripted_attention()(
+                *self._run_gru(self._embed_packed(x))
+            )
+        if lengths is None:
+            lengths = self._get_lengths(x)
+        order = torch.argsort(lengths, descending=True, stable=True)
+        x: r.PackedSequence = self._pack_sequences(
+            [x[index] for index in order.tolist()]
+        )
+        x, alpha = self._scripted_attention()(*self._run_gru(x))
+        inverse = self._invert_order(order)
+        return x[inverse], alpha[:, inverse]
 
     def sparse_dense_parameters(
         self,
     ) -> t.Tuple[list[nn.parameter.Parameter], list[nn.parameter.Parameter]]:
-        """Return the parameters for sparse and dense parameters."""
+        """Return the parameters for sparse and dense parameters.
+
+        The dense list of the dense branch holds only the embedding
+        parameters; the classifiers build their full dense lists from
+        their own `parameters()`.
+
+        """
         if self._embedding.sparse:
-            sparse = list(self._embedding.parameters())[0]
-            return [sparse], [p for p in self.parameters() if p is not sparse]
+            sparse = list(self._embedding.parameters())
+            sparse_ids = set(id(s) for s in sparse)
+            return sparse, [
+                p for p in self.parameters() if id(p) not in sparse_ids
+            ]
         return [], list(self._embedding.parameters())
 
-    def _get_lengths(self, x: list[torch.Tensor]) -> list[int]:
-        """Get the lengths of each item."""
-        return [e.size()[0] for e in x]
+    def _scripted_attention(self) -> nn.Module:
+        """Return the TorchScript form of `self._attention_model`.
+
+        The scripted module shares its parameters with the eager
+        one.  Cache it outside the module state because TorchScript
+        modules cannot go through `torch.save`.
+
+        """
+        scripted = self.__dict__.get("_scripted")
+        if scripted is None:
+            scripted = a.script(self._attention_model)
+            self.__dict__["_scripted"] = scripted
+        return scripted
+
+    def __getstate__(self):
+        """Drop the TorchScript cache, which pickle cannot handle."""
+        state = self.__dict__.copy()
+        state.pop("_scripted", None)
+        return state
+
+    def _pack_sequences(self, x: list[torch.Tensor]) -> r.PackedSequence:
+        """Pack the index sequences, and embed the packed words.
 
-    def _pad_sequence(self, x: list[torch.Tensor]) -> torch.Tensor:
-        """Pad a list of variable neght tensors with `self.padding_idx`."""
-        return r.pad_sequence(x, padding_value=self._embedding.padding_idx).to(
-            torch.int
+        `x` must be sorted by length in a decreasing order.  Packing
+        before the embedding lookup skips both the padded index
+        matrix and the embedding rows of the padding positions.
+
+        """
+        return self._embed_packed(r.pack_sequence(x))
+
+    def _embed_packed(self, x: r.PackedSequence) -> r.PackedSequence:
+        """Embed the words of an already packed batch."""
+        return r.PackedSequence(
+            self._embedding(x.data.to(torch.long)),
+            x.batch_sizes,
+            x.sorted_indices,
+            x.unsorted_indices,
         )
 
-    def _pack_embeddings(
-        self, x: torch.Tensor, lengths: list[int]
-    ) -> r.PackedSequence:
-        """Pack padded and embedded words.
+    def _run_gru(
+        self, x: r.PackedSequence
+    ) -> t.Tuple[torch.Tensor, torch.Tensor]:
+        """Run `_gru_block`, checkpointing it in training.
+
+        The GRU activations dominate the memory for long sequences.
+        Recompute them in backward instead of keeping them.  The
+        embedding is not checkpointed; its activation is cheap.
+
+        """
+        if self.training:
+            return c.checkpoint(
+                self._gru_block,
+                x,
+                use_reentrant=False,
+                preserve_rng_state=True,
+            )
+        return self._gru_block(x)
+
+    def _gru_block(
+        self, x: r.PackedSequence
+    ) -> t.Tuple[torch.Tensor, torch.Tensor]:
+        """Run the GRU over the packed embeddings, and pad the output.
 
-        The shape of `x` is
-        (the longest length of the sentences, batch size, embedding dim).
+        Return the padded output with the lengths of the entries.
+        Keep this stage a function of its arguments so
+        `torch.utils.checkpoint` can recompute it in backward.
 
         """
-        return r.pack_padded_sequence(x, lengths, enforce_sorted=False)
+        x = self._gru(x)[0]
+        # Linear cannot accept any packed sequences.
+        return r.pad_packed_sequence(x)
+
+    def _invert_order(self, order: torch.Tensor) -> torch.Tensor:
+        """Create the permutation that restores the original order."""
+        inverse = torch.empty_like(order)
+        inverse[order] = torch.arange(order.size(0))
+        return inverse
+
+    def _get_lengths(self, x: list[torch.Tensor]) -> torch.Tensor:
+        """Get the lengths of each item as one int64 tensor."""
+        return torch.as_tensor([e.size(0) for e in x])
+
+
+class QuantizedEmbedding(nn.Module):
+    """Hold a frozen embedding as int8 with one scale per row.
+
+    Dequantize the looked-up rows on the fly, so the weights take a
+    quarter of the memory of a float32 embedding.  The embedding is
+    not trainable.
+
+    """
+
+    def __init__(self, embeddings: torch.Tensor, padding_idx: int = 0):
+        """Quantize `embeddings` row-wise.
+
+        The shape of `embeddings` is
+        (the vocabulary size, embedding dim).
+
+        """
+        super(QuantizedEmbedding, self).__init__()
+        scales = (embeddings.abs().amax(dim=1, keepdim=True) / 127.0).clamp(
+            min=1e-12
+        )
+        self.register_buffer(
+            "weight", torch.round(embeddings / scales).to(torch.int8)
+        )
+        self.register_buffer("scales", scales.to(torch.float32))
+        self.embedding_dim = embeddings.shape[1]
+        self.padding_idx = padding_idx
+        self.sparse = False
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """Look the rows of the index tensor `x` up, and dequantize."""
+        return self.weight[x].to(torch.float32) * self.scales[x]
 
 
 class SentenceModelFactory:
@@ -108,13 +223,23 @@ class SentenceModelFactory:
         gru_hidden_size: t.Optional[int] = None,
         sentence_dim: t.Optional[int] = None,
     ) -> SentenceModel:
-        """Take hyper parameters."""
+        """Take hyper parameters.
+
+        Unless `embedding_sparse` is given, the embedding is dense,
+        which keeps every parameter on the single fused optimizer
+        path.  The default turns sparse only when `vocabulary_size`
+        exceeds a million words, where the dense embedding gradient
+        becomes the bottleneck.
+
+        """
         return self._create(
             embedding=nn.Embedding(
                 num_embeddings=vocabulary_size,
                 embedding_dim=get_default(embedding_dim, 200),
                 padding_idx=get_default(padding_idx, 0),
-                sparse=get_default(embedding_sparse, True),
+                sparse=get_default(
+                    embedding_sparse, vocabulary_size > 1_000_000
+                ),
             ),
             gru_hidden_size=gru_hidden_size,
             sentence_dim=sentence_dim,
@@ -128,8 +253,26 @@ class SentenceModelFactory:
         embedding_sparse: t.Optional[int] = None,
         gru_hidden_size: t.Optional[int] = None,
         sentence_dim: t.Optional[int] = None,
+        quantize: t.Optional[bool] = None,
     ) -> SentenceModel:
-        """Use a pretrained word embedding."""
+        """Use a pretrained word embedding.
+
+        If `quantize` is `True`, hold the embedding as a row-wise
+        int8 `QuantizedEmbedding`.  Quantization requires `freeze`.
+
+        """
+        if get_default(quantize, False):
+            if not get_default(freeze, True):
+                raise RuntimeError(
+                    "quantize requires a frozen embedding."
+                )
+            return self._create(
+                embedding=QuantizedEmbedding(
+                    embeddings, padding_idx=get_default(padding_idx, 0)
+                ),
+                gru_hidden_size=gru_hidden_size,
+                sentence_dim=sentence_dim,
+            )
         return self._create(
             embedding=nn.Embedding.from_pretrained(
                 embeddings,
@@ -174,14 +317,19 @@ class SentenceClassifier(nn.Module):
             self._sentence_model.sentence_dim, num_of_classes
         )
 
-    def forward(self, x: list[torch.Tensor]) -> torch.Tensor:
+    def forward(
+        self,
+        x: t.Union[list[torch.Tensor], r.PackedSequence],
+        lengths: t.Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
         """Calculate sentence vectors, and attentions.
 
-        x is a list of sentences.
-        A sentence is a tensor that each word index.
+        x is a list of sentences, or a `PackedSequence` of them.
+        A sentence is a tensor that each word index.  See
+        `SentenceModel.forward` about `lengths`.
 
         """
-        x, alpha = self._sentence_model(x)
+        x, alpha = self._sentence_model(x, lengths)
         x = self._linear(x)
         if self.training:
             return x, alpha
@@ -197,8 +345,9 @@ class SentenceClassifier(nn.Module):
 
         """
         sparse = self._sentence_model.sparse_dense_parameters()[0]
+        sparse_ids = set(id(s) for s in sparse)
         return sparse, [
-            p for p in self.parameters() if not [s for s in sparse if s is p]
+            p for p in self.parameters() if id(p) not in sparse_ids
         ]
 
 
@@ -239,6 +388,7 @@ class SentenceClassifierFactory:
         embedding_sparse: t.Optional[int] = None,
         gru_hidden_size: t.Optional[int] = None,
         sentence_dim: t.Optional[int] = None,
+        quantize: t.Optional[bool] = None,
     ) -> SentenceClassifier:
         """Use pretrained embeddings."""
         return self._create(
@@ -249,6 +399,7 @@ class SentenceClassifierFactory:
                 embedding_sparse=embedding_sparse,
                 gru_hidden_size=gru_hidden_size,
                 sentence_dim=sentence_dim,
+                quantize=quantize,
             ),
             num_classes=num_classes,
         )
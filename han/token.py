@@ -1,23 +1,55 @@
 """Text tokenization."""
+import functools
+import typing as t
 import torchtext.data as d
 
 
 class Tokenizer:
     """Tokenizer."""
 
-    def __init__(self, tokenizer: str = "basic_english"):
+    def __init__(
+        self,
+        tokenizer: str = "basic_english",
+        cache_size: t.Optional[int] = 2**20,
+    ):
         """Take a tokenizer name.
 
         If tokenizer is basic_english,
         __call__ makes letters lower.
 
+        `__call__` memoizes up to `cache_size` texts so a text is
+        tokenized once even if the training loop visits it every
+        epoch.  Pass `0` to disable the cache.  The callers must not
+        mutate the returned lists because the cache shares them.
+
         References
         ----------
         https://pytorch.org/text/stable/data_utils.html#torchtext.data.utils.get_tokenizer
 
         """
         self.tokenizer = d.get_tokenizer(tokenizer)
+        self._cache_size = cache_size
+        self._build_cache()
 
     def __call__(self, text: str) -> list[str]:
         """Tokenize text."""
-        return self.tokenizer(text)
+        return self._tokenize(text)
+
+    def _build_cache(self):
+        if self._cache_size == 0:
+            self._tokenize = self.tokenizer
+        else:
+            self._tokenize = functools.lru_cache(maxsize=self._cache_size)(
+                self.tokenizer
+            )
+
+    def __getstate__(self):
+        """Drop the cache; pickle cannot handle `lru_cache`."""
+        state = self.__dict__.copy()
+        del state["_tokenize"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state, and rebuild the cache."""
+        self.__dict__.update(state)
+        self._build_cache()
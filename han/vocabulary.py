@@ -1,25 +1,39 @@
 """Word embedding."""
+import collections
+import collections.abc
 import typing as t
 import torchtext.vocab as v
 import torch
 
 
 def build_vocabulary(
-    sentences: t.Iterator[t.Iterator[str]],
+    sentences: t.Union[t.Iterator[t.Iterator[str]], t.Mapping[str, int]],
     pad_symbol: str = "<pad>",
     unknown_symbol: str = "<unk>",
 ) -> v.Vocab:
     """Build vocabulary.
 
-    Each element of `sentences` is a list of words.  The vocabulary
+    Each element of `sentences` is a list of words.  `sentences` can
+    also be a mapping from a word to its count, such as
+    `collections.Counter`, so a corpus that is already tokenized and
+    counted does not have to be streamed again.  The vocabulary
     encode unknown word to the indice of `unknown_symbol`.
 
     """
-    vocab: v.Vocab = v.build_vocab_from_iterator(
-        (sentence for sentence in sentences),
-        special_first=True,
-        specials=[pad_symbol, unknown_symbol],
-    )
+    if isinstance(sentences, collections.abc.Mapping):
+        vocab: v.Vocab = v.vocab(
+            collections.OrderedDict(
+                sorted(sentences.items(), key=lambda e: -e[1])
+            ),
+            specials=[pad_symbol, unknown_symbol],
+            special_first=True,
+        )
+    else:
+        vocab: v.Vocab = v.build_vocab_from_iterator(
+            (sentence for sentence in sentences),
+            special_first=True,
+            specials=[pad_symbol, unknown_symbol],
+        )
     vocab.set_default_index(1)
     return vocab
 
@@ -67,7 +81,9 @@ class _VocabularyImpl:
         self._default_idx = default_idx
 
     def forward(self, words: list[str]) -> list[int]:
-        return [self.__getitem__(word) for word in words]
+        get = self._dictionary.get
+        default_idx = self._default_idx
+        return [get(word, default_idx) for word in words]
 
     def __getitem__(self, s: str) -> int:
         return self._dictionary.get(s, self._default_idx)
@@ -79,6 +95,86 @@ class _VocabularyImpl:
         return len(self._dictionary)
 
 
+def create_matrix(
+    sentences: t.Iterable[t.Iterable[str]],
+    vocab: VocabularyProtocol,
+    pad_idx: int = 0,
+) -> torch.Tensor:
+    """Encode `sentences` to a padded index matrix.
+
+    Look the concatenated words up with one vocabulary call, then
+    split the result back into per-sentence tensors.  The shape of
+    the returned tensor is (the length of the longest sentence, the
+    number of sentences).  Fill the padding positions with
+    `pad_idx`.
+
+    """
+    sents = [list(words) for words in sentences]
+    lengths = [len(sentence) for sentence in sents]
+    ids = torch.as_tensor(
+        vocab.forward(
+            [word for sentence in sents for word in sentence]
+        ),
+        dtype=torch.long,
+    )
+    return _pad_ids(ids, lengths, pad_idx)
+
+
+def _pad_ids(
+    ids: torch.Tensor, lengths: list[int], pad_idx: int
+) -> torch.Tensor:
+    """Pad `ids` through the compiled scatter, compiling it lazily.
+
+    The first call wraps `_scatter_ids` with
+    `torch.compile(dynamic=True)` when the installed torch has the
+    compiler.  Fall back to the eager implementation if the compiler
+    rejects the running interpreter or the compiled call fails,
+    mirroring `han.model.attention.script`.
+
+    """
+    global _scatter
+    if _scatter is None:
+        try:
+            _scatter = (
+                torch.compile(_scatter_ids, dynamic=True)
+                if hasattr(torch, "compile")
+                else _scatter_ids
+            )
+        except RuntimeError:
+            _scatter = _scatter_ids
+    try:
+        return _scatter(ids, lengths, pad_idx)
+    except RuntimeError:
+        _scatter = _scatter_ids
+        return _scatter(ids, lengths, pad_idx)
+
+
+_scatter: t.Optional[
+    t.Callable[[torch.Tensor, list[int], int], torch.Tensor]
+] = None
+
+
+def _scatter_ids(
+    ids: torch.Tensor, lengths: list[int], pad_idx: int
+) -> torch.Tensor:
+    """Scatter `ids` into one preallocated padded matrix.
+
+    Fill the destination with `pad_idx` once via `torch.full`, and
+    copy every sentence in with a single index assignment instead of
+    one `pad_sequence` copy per sentence.
+
+    """
+    lens = torch.as_tensor(lengths)
+    offsets = torch.cumsum(lens, 0) - lens
+    cols = torch.repeat_interleave(torch.arange(lens.size(0)), lens)
+    rows = torch.arange(ids.size(0)) - offsets[cols]
+    res = torch.full(
+        (int(lens.max()), lens.size(0)), pad_idx, dtype=ids.dtype
+    )
+    res[rows, cols] = ids
+    return res
+
+
 def create_vocab(
     embedding: EmbeddingProtocol,
     pad_symbol: str = "<pad>",
@@ -94,10 +190,11 @@ def create_vocab(
     d[unknown_symbol] = 1
     c = 2
     dim = embedding.vectors.shape[1]
-    weights = [torch.Tensor([0] * dim), torch.Tensor([0] * dim)]
+    weights = [torch.zeros(dim), torch.zeros(dim)]
+    specials = set([pad_symbol, unknown_symbol])
 
     for index, word in enumerate(embedding.itos):
-        if word not in set([pad_symbol, unknown_symbol]):
+        if word not in specials:
             d[word] = c
             c += 1
             weights.append(embedding.vectors[index, :])
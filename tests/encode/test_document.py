@@ -14,12 +14,12 @@ class DocumentEncoderTestCase(unittest.TestCase):
             res,
             [
                 [
-                    torch.Tensor([vocab["apple"], vocab["is"], vocab["."]]),
-                    torch.Tensor([vocab["tasty"]]),
+                    torch.tensor([vocab["apple"], vocab["is"], vocab["."]]),
+                    torch.tensor([vocab["tasty"]]),
                 ],
                 [
-                    torch.Tensor([vocab["tasty"], vocab["."]]),
-                    torch.Tensor([vocab["is"], vocab["apple"]]),
+                    torch.tensor([vocab["tasty"], vocab["."]]),
+                    torch.tensor([vocab["is"], vocab["apple"]]),
                 ],
             ],
         )
@@ -1,5 +1,6 @@
 import unittest
 import torch
+import torch.nn.utils.rnn as rnn
 import torch.testing as tt
 import torch.utils.data as da
 import han.vocabulary as v
@@ -36,6 +37,18 @@ class AgNewsCollateSentenceFnTestCase(unittest.TestCase):
             tt.assert_close(labels, torch.Tensor([1, 2, 0]).to(torch.long))
 
 
+class AgNewsCollateSentenceFnPackTestCase(unittest.TestCase):
+    def test_call(self):
+        vocabulary = v.build_vocabulary([["apple", "banana", "cat"]])
+        sut = ag.AgNewsCollateSentenceFn(
+            s.SentenceEncoder(vocabulary), False, pack=True
+        )
+        texts, labels = sut([(1, "apple"), (2, "banana apple")])
+        self.assertIsInstance(texts, rnn.PackedSequence)
+        self.assertEqual(texts.batch_sizes.tolist(), [2, 1])
+        tt.assert_close(labels, torch.tensor([0, 1]))
+
+
 class AgNewsCollateDocumentFnTestCase(unittest.TestCase):
     def test(self):
         vocabulary = v.build_vocabulary(
@@ -57,12 +70,12 @@ class AgNewsCollateDocumentFnTestCase(unittest.TestCase):
             documents,
             [
                 [
-                    torch.Tensor(vocabulary.forward(["duck", "lion", "."])),
-                    torch.Tensor(vocabulary.forward(["cat", "."])),
+                    torch.tensor(vocabulary.forward(["duck", "lion", "."])),
+                    torch.tensor(vocabulary.forward(["cat", "."])),
                 ],
-                [torch.Tensor(vocabulary.forward(["dog"]))],
+                [torch.tensor(vocabulary.forward(["dog"]))],
                 [
-                    torch.Tensor(
+                    torch.tensor(
                         vocabulary.forward(["penguin", "banana", "apple", "."])
                     )
                 ],
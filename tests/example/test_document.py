@@ -14,6 +14,7 @@ class TrainTestCase(unittest.TestCase):
             self.model_file,
             train_num=100,
             test_num=50,
+            embedding_sparse=True,
             device="cpu",
         )
         self.assertTrue(os.path.exists(self.encoder_file))
@@ -15,6 +15,7 @@ class TestTrainCase(unittest.TestCase):
             self.model_file,
             10,
             10,
+            embedding_sparse=True,
             device="cpu",
         )
         self.assertTrue(os.path.exists(self.encoder_file))
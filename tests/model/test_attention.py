@@ -22,6 +22,13 @@ class AttentionModelTestCase(unittest.TestCase):
             torch.Tensor([[6.0, 20.0], [11.0, 13.0], [4.0, 13.0], [4.0, 5.0]]),
         )
 
+    def test_forward_mask(self):
+        sut = a.AttentionModel(3)
+        h = torch.rand(4, 2, 3)
+        _, alpha = sut(h, torch.tensor([4, 2]))
+        te.assert_close(alpha[2:, 1], torch.zeros(2))
+        te.assert_close(alpha.sum(0), torch.ones(2))
+
     def test_softmax(self):
         sut = a.AttentionModel(1)
         res = sut._sofmax(torch.Tensor([[1, 2], [3, 0], [3, 1]]))
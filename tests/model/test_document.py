@@ -1,3 +1,4 @@
+import io
 import unittest
 import torch.testing as te
 import torch
@@ -38,6 +39,17 @@ class DocumentModelTestCase(unittest.TestCase):
 
 
 class DocumentClassifierTestCase(unittest.TestCase):
+    def test_torch_save(self):
+        sut = d.DocumentClassifierFactory().create(10, 3)
+        sut.eval()
+        with torch.no_grad():
+            sut([[torch.tensor([1, 2])]])
+        buffer = io.BytesIO()
+        torch.save(sut, buffer)
+        buffer.seek(0)
+        res = torch.load(buffer, weights_only=False)
+        self.assertIsInstance(res, d.DocumentClassifier)
+
     def test_eval(self):
         sut = d.DocumentClassifierFactory().create(10, 3)
         sut.eval()
@@ -1,5 +1,7 @@
+import io
 import unittest
 import torch
+import torch.nn.utils.rnn as r
 import torch.testing as te
 import han.model.sentence as m
 
@@ -9,51 +11,61 @@ class SetenceModelTestCase(unittest.TestCase):
         self.sut = m.SentenceModelFactory().create(vocabulary_size=10)
 
     def test_sparse(self):
-        sparse, dense = self.sut.sparse_dense_parameters()
+        sut = m.SentenceModelFactory().create(
+            vocabulary_size=10, embedding_sparse=True
+        )
+        sparse, dense = sut.sparse_dense_parameters()
         self.assertEqual(len(sparse), 1)
 
-    def test_pack_embeddings(self):
-        a = torch.Tensor(
-            [
-                [[2, 2], [1, 1], [8, 8]],
-                [[5, 5], [4, 4], [0, 0]],
-                [[7, 7], [0, 0], [0, 0]],
-            ]
-        )
-        self.assertEqual(torch.Size([3, 3, 2]), a.shape)
-        res = self.sut._pack_embeddings(
-            a,
-            [3, 2, 1],
-        )
+    def test_dense_default(self):
+        sparse, dense = self.sut.sparse_dense_parameters()
+        self.assertEqual(sparse, [])
 
-        te.assert_allclose(
-            res.data,
-            torch.Tensor(
-                [
-                    [2.0, 2.0],
-                    [1.0, 1.0],
-                    [8.0, 8.0],
-                    [5.0, 5.0],
-                    [4.0, 4.0],
-                    [7.0, 7.0],
-                ]
-            ),
+    def test_pack_sequences(self):
+        res = self.sut._pack_sequences(
+            [torch.tensor([3, 3, 3]), torch.tensor([2])]
+        )
+        self.assertEqual(res.batch_sizes.tolist(), [2, 1, 1])
+        self.assertEqual(
+            res.data.shape,
+            torch.Size([4, self.sut._embedding.embedding_dim]),
         )
 
     def test_get_lengths(self):
         res = self.sut._get_lengths(
             [torch.tensor([3, 3, 3]), torch.tensor([2])]
         )
-        self.assertEqual(res, [3, 1])
+        te.assert_close(res, torch.tensor([3, 1]))
 
-    def test_pad_sequence(self):
-        res = self.sut._pad_sequence(
-            [torch.tensor([3, 3, 3]), torch.tensor([2])]
-        )
+
+class QuantizedEmbeddingTestCase(unittest.TestCase):
+    def test_forward(self):
+        weights = torch.Tensor([[0, 0], [1.0, -2.0], [0.5, 0.25]])
+        sut = m.QuantizedEmbedding(weights)
+        res = sut(torch.tensor([1, 2]))
         te.assert_close(
-            res, torch.tensor([[3, 2], [3, 0], [3, 0]]).to(torch.int)
+            res,
+            torch.Tensor([[1.0, -2.0], [0.5, 0.25]]),
+            atol=0.02,
+            rtol=0.02,
         )
 
+    def test_use_pretrained(self):
+        weights = torch.vstack([torch.zeros(8) for _ in range(5)])
+        sut = m.SentenceModelFactory().use_pretrained(
+            weights, quantize=True
+        )
+        sparse, dense = sut.sparse_dense_parameters()
+        self.assertEqual(sparse, [])
+        self.assertEqual(dense, [])
+
+    def test_use_pretrained_unfrozen(self):
+        weights = torch.vstack([torch.zeros(8) for _ in range(5)])
+        with self.assertRaises(RuntimeError):
+            m.SentenceModelFactory().use_pretrained(
+                weights, freeze=False, quantize=True
+            )
+
 
 class SentenceClassifierTestCase(unittest.TestCase):
     def test_softmax(self):
@@ -68,6 +80,38 @@ class SentenceClassifierTestCase(unittest.TestCase):
                 torch.sum(res[1, :]), torch.tensor(1).to(torch.float)
             )
 
+    def test_torch_save(self):
+        sut = m.SentenceClassifierFactory().create(4, vocabulary_size=30)
+        sut.eval()
+        with torch.no_grad():
+            sut([torch.tensor([1, 2, 3])])
+        buffer = io.BytesIO()
+        torch.save(sut, buffer)
+        buffer.seek(0)
+        res = torch.load(buffer, weights_only=False)
+        self.assertIsInstance(res, m.SentenceClassifier)
+
+    def test_precomputed_lengths(self):
+        sut = m.SentenceClassifierFactory().create(4, vocabulary_size=30)
+        sut.eval()
+        sentences = [torch.tensor([1, 2, 3]), torch.tensor([1])]
+        with torch.no_grad():
+            res = sut(sentences)[0]
+            with_lengths = sut(sentences, torch.tensor([3, 1]))[0]
+        te.assert_close(res, with_lengths)
+
+    def test_packed_input(self):
+        sut = m.SentenceClassifierFactory().create(4, vocabulary_size=30)
+        sut.eval()
+        with torch.no_grad():
+            res = sut(
+                r.pack_sequence(
+                    [torch.tensor([1, 2, 3]), torch.tensor([1])],
+                    enforce_sorted=False,
+                )
+            )[0]
+        self.assertEqual(res.shape, torch.Size([2, 4]))
+
     def test_sparse_dense_parameters(self):
         sut = m.SentenceClassifierFactory().create(
             num_classes=4, vocabulary_size=30, embedding_sparse=False
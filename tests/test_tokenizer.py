@@ -1,3 +1,4 @@
+import pickle
 import unittest
 import han.token as t
 
@@ -10,3 +11,17 @@ class Test(unittest.TestCase):
             ["you", "can", "now", "install", "torchtext", "using", "pip", "!"],
             res,
         )
+
+    def test_cache(self):
+        tokenizer = t.Tokenizer()
+        self.assertIs(tokenizer("A dog runs."), tokenizer("A dog runs."))
+
+    def test_no_cache(self):
+        tokenizer = t.Tokenizer(cache_size=0)
+        self.assertIsNot(tokenizer("A dog runs."), tokenizer("A dog runs."))
+
+    def test_pickle(self):
+        tokenizer = t.Tokenizer()
+        tokenizer("A dog runs.")
+        res = pickle.loads(pickle.dumps(tokenizer))
+        self.assertEqual(res("A dog runs."), ["a", "dog", "runs", "."])
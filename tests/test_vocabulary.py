@@ -18,6 +18,35 @@ class VocabularyTestCase(unittest.TestCase):
         self.assertEqual(sut["a"], 1)
 
 
+class BuildVocabularyFromCountsTestCase(unittest.TestCase):
+    def test(self):
+        sut = v.build_vocabulary(collections.Counter({"blue": 2, "glass": 1}))
+        self.assertEqual(
+            set(sut.get_stoi().keys()),
+            set(["blue", "glass", "<pad>", "<unk>"]),
+        )
+        self.assertEqual(sut["a"], 1)
+        self.assertEqual(sut["<pad>"], 0)
+
+
+class CreateMatrixTestCase(unittest.TestCase):
+    def test(self):
+        vocab = v.build_vocabulary([["blue", "glass"]])
+        res = v.create_matrix(
+            [["blue", "glass", "blue"], ["glass"]], vocab
+        )
+        te.assert_close(
+            res,
+            torch.tensor(
+                [
+                    [vocab["blue"], vocab["glass"]],
+                    [vocab["glass"], 0],
+                    [vocab["blue"], 0],
+                ]
+            ),
+        )
+
+
 class CreateVocabTestCase(unittest.TestCase):
     def test(self):
         embedding = collections.namedtuple("Temp", "itos")